@@ -27,11 +27,11 @@ def load_data(patient_flow_path='sg2_patient_flow.csv', salesforce_path='salesfo
 
 def aggregate_metrics(patient_flow: pd.DataFrame) -> pd.DataFrame:
     """Aggregate patient metrics by provider."""
-    summary = patient_flow.groupby('referral_provider').agg(
+    summary = patient_flow.groupby('referral_provider', as_index=False, sort=False).agg(
         total_patients=('patient_id', 'count'),
         avg_length_of_stay=('length_of_stay', 'mean'),
         avg_satisfaction=('satisfaction_score', 'mean')
-    ).reset_index()
+    )
     return summary
 
 
@@ -52,12 +52,24 @@ def train_regression(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def save_to_sqlite(patient_flow: pd.DataFrame, salesforce: pd.DataFrame, summary: pd.DataFrame, db_path='healthcare_bi.db'):
-    """Persist datasets to a SQLite database for API consumption."""
+    """Persist datasets to a SQLite database for API consumption.
+
+    Each table is bulk-inserted with ``executemany`` in large chunks, and
+    ``provider_summary`` is indexed on ``referral_provider`` so the API's
+    per-provider lookup is a B-tree seek rather than a table scan.
+    """
     conn = sqlite3.connect(db_path)
-    patient_flow.to_sql('patient_flow', conn, if_exists='replace', index=False)
-    salesforce.to_sql('salesforce_providers', conn, if_exists='replace', index=False)
-    summary.to_sql('provider_summary', conn, if_exists='replace', index=False)
-    conn.close()
+    try:
+        patient_flow.to_sql('patient_flow', conn, if_exists='replace', index=False, chunksize=10_000)
+        salesforce.to_sql('salesforce_providers', conn, if_exists='replace', index=False, chunksize=10_000)
+        summary.to_sql('provider_summary', conn, if_exists='replace', index=False, chunksize=10_000)
+        with conn:
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_provider_summary_referral_provider '
+                'ON provider_summary (referral_provider)'
+            )
+    finally:
+        conn.close()
 
 
 if __name__ == '__main__':
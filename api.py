@@ -4,39 +4,130 @@ A simple Flask API to expose the aggregated business‑intelligence data.
 Endpoints:
   - `/providers`          : Return a list of providers with summary metrics.
   - `/providers/<name>`   : Return summary data for a specific provider.
+  - `/providers.ndjson`   : Stream all providers as newline-delimited JSON.
 
 The API reads from a SQLite database (`healthcare_bi.db`) created by `analysis.py`.
+Connections are kept in a small pool and reused across requests so the SQLite
+page cache stays warm.  Serialized responses are cached until the database file
+changes and are served with an ETag so clients can revalidate with a 304.
 """
 
-from flask import Flask, jsonify, abort
+from flask import Flask, Response, abort, g, request, stream_with_context
+from functools import lru_cache
+import hashlib
+import orjson
+import os
+import queue
 import sqlite3
 
 DB_PATH = 'healthcare_bi.db'
+POOL_SIZE = 4
 
 app = Flask(__name__)
 
+_pool = queue.Queue(maxsize=POOL_SIZE)
+# (version, body, etag) for /providers, replaced as a whole so readers never mix entries
+_CACHE = None
 
-def query_db(query, args=()):
-    conn = sqlite3.connect(DB_PATH)
+
+def _connect():
+    """Open a connection tuned for the read-heavy API workload."""
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA cache_size=-65536')
+    return conn
+
+
+def get_db():
+    """Borrow a pooled connection for the current app context."""
+    if 'db' not in g:
+        try:
+            g.db = _pool.get_nowait()
+        except queue.Empty:
+            g.db = _connect()
+    return g.db
+
+
+@app.teardown_appcontext
+def release_db(exc):
+    """Return the borrowed connection to the pool, closing it if the pool is full."""
+    conn = g.pop('db', None)
+    if conn is None:
+        return
+    try:
+        _pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+
+def query_db(query, args=(), conn=None):
+    if conn is None:
+        conn = get_db()
     cur = conn.execute(query, args)
-    results = [dict(row) for row in cur.fetchall()]
-    conn.close()
-    return results
+    return [dict(row) for row in cur.fetchall()]
+
+
+def _mtime_ns(path):
+    # The -wal file can vanish at any moment when SQLite checkpoints, so stat directly
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _db_version():
+    """Return a key that changes whenever the database (or its WAL) is written."""
+    return (_mtime_ns(DB_PATH), _mtime_ns(DB_PATH + '-wal'))
+
+
+def _serialize(data):
+    body = orjson.dumps(data)
+    return body, hashlib.md5(body).hexdigest()
+
+
+def _cached_response(body, etag):
+    """Build a JSON response that answers 304 when the client's ETag matches."""
+    resp = Response(body, mimetype='application/json')
+    resp.set_etag(etag)
+    return resp.make_conditional(request)
+
+
+@lru_cache(maxsize=128)
+def _provider_payload(version, provider_name):
+    data = query_db('SELECT * FROM provider_summary WHERE referral_provider = ?', (provider_name,))
+    if not data:
+        return None
+    return _serialize(data[0])
 
 
 @app.route('/providers', methods=['GET'])
 def get_providers():
-    data = query_db('SELECT * FROM provider_summary')
-    return jsonify(data)
+    global _CACHE
+    version = _db_version()
+    entry = _CACHE
+    if entry is None or entry[0] != version:
+        entry = _CACHE = (version, *_serialize(query_db('SELECT * FROM provider_summary')))
+    _, body, etag = entry
+    return _cached_response(body, etag)
+
+
+@app.route('/providers.ndjson', methods=['GET'])
+def stream_providers():
+    """Stream provider rows one JSON document per line without buffering the table."""
+    def generate():
+        for row in get_db().execute('SELECT * FROM provider_summary'):
+            yield orjson.dumps(dict(row)) + b'\n'
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
 
 
 @app.route('/providers/<provider_name>', methods=['GET'])
 def get_provider(provider_name):
-    data = query_db('SELECT * FROM provider_summary WHERE referral_provider = ?', (provider_name,))
-    if not data:
+    payload = _provider_payload(_db_version(), provider_name)
+    if payload is None:
         abort(404, description='Provider not found')
-    return jsonify(data[0])
+    return _cached_response(*payload)
 
 
 if __name__ == '__main__':
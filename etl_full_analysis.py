@@ -8,29 +8,55 @@ This script performs the following:
 4. Train a regression model to predict opportunity value based on provider metrics.
 5. Export outputs:
    - A provider summary CSV with actual and predicted values.
-   - An Excel file with multiple tabs for Power BI import (SG2, CRM, EHR, Summary).
-   - Optional charts illustrating key relationships (patient volume, ROI vs cost, predicted vs actual).
+   - An Excel file with multiple tabs for Power BI import (SG2, CRM, EHR, Summary);
+     pass --no-xlsx to skip it.
+   - Optional charts illustrating key relationships (patient volume, ROI vs cost, predicted vs actual);
+     pass --charts to render them.
 
 The goal of this script is to demonstrate data engineering, analytics and
 predictive modelling capabilities consistent with the CARTI job
 description.
 """
 
+import argparse
+import os
+
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error, r2_score
-from sklearn.preprocessing import StandardScaler
-from sklearn.pipeline import make_pipeline
-import matplotlib.pyplot as plt
+from pandas.api.types import union_categoricals
+
+
+def read_table(stem: str, parse_dates=None) -> pd.DataFrame:
+    """Read ``<stem>.parquet`` if it is up to date, otherwise parse ``<stem>.csv``.
+
+    The CSV fallback uses the multi-threaded PyArrow parser.
+    """
+    csv_path, parquet_path = f"{stem}.csv", f"{stem}.parquet"
+    if os.path.exists(parquet_path) and (
+        not os.path.exists(csv_path) or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+    ):
+        return pd.read_parquet(parquet_path)
+    return pd.read_csv(csv_path, engine="pyarrow", parse_dates=parse_dates)
 
 
 def load_data():
-    """Load the synthetic CSV files into pandas DataFrames."""
-    sg2 = pd.read_csv("sg2_patient_flow_full.csv", parse_dates=["admission_date", "discharge_date"])
-    crm = pd.read_csv("salesforce_crm_full.csv")
-    ehr = pd.read_csv("ehr_data_full.csv", parse_dates=["visit_date"])
+    """Load the synthetic datasets into pandas DataFrames."""
+    sg2 = read_table("sg2_patient_flow_full", parse_dates=["admission_date", "discharge_date"])
+    crm = read_table("salesforce_crm_full")
+    ehr = read_table("ehr_data_full", parse_dates=["visit_date"])
+
+    # Low-cardinality keys become categoricals sharing one provider dtype so
+    # groupby and merge work on integer codes rather than strings.
+    provider_dtype = union_categoricals(
+        [sg2["referral_provider"].astype("category"),
+         crm["provider_name"].astype("category"),
+         ehr["provider_name"].astype("category")],
+        sort_categories=True,
+    ).dtype
+    sg2["referral_provider"] = sg2["referral_provider"].astype(provider_dtype)
+    sg2["service_line"] = sg2["service_line"].astype("category")
+    crm["provider_name"] = crm["provider_name"].astype(provider_dtype)
+    ehr["provider_name"] = ehr["provider_name"].astype(provider_dtype)
     return sg2, crm, ehr
 
 
@@ -46,32 +72,42 @@ def integrate_data(sg2: pd.DataFrame, crm: pd.DataFrame, ehr: pd.DataFrame) -> p
         summary: Aggregated metrics for each provider.
     """
     # Aggregate SG2 patient records by provider
-    sg2_agg = sg2.groupby("referral_provider").agg(
+    sg2_agg = sg2.groupby("referral_provider", as_index=False, sort=False, observed=True).agg(
         total_patients=("patient_id", "count"),
         avg_length_of_stay=("length_of_stay", "mean"),
         avg_satisfaction=("satisfaction_score", "mean"),
         avg_cost=("treatment_cost", "mean"),
-    ).reset_index().rename(columns={"referral_provider": "provider_name"})
+    ).rename(columns={"referral_provider": "provider_name"})
 
-    # Aggregate EHR claims by provider
-    ehr_agg = ehr.groupby("provider_name").agg(
+    # Aggregate EHR claims by provider; flag denials up front so the rate is a built-in mean
+    ehr = ehr.assign(is_denied=ehr["claim_status"].to_numpy() == "Denied")
+    ehr_agg = ehr.groupby("provider_name", as_index=False, sort=False, observed=True).agg(
         total_visits=("patient_id", "count"),
         total_claim_amount=("claim_amount", "sum"),
         total_claim_paid=("claim_paid", "sum"),
-        denial_rate=("claim_status", lambda x: (x == "Denied").mean()),
-    ).reset_index()
+        denial_rate=("is_denied", "mean"),
+    )
 
     # Merge all together on provider name
     merged = sg2_agg.merge(crm, on="provider_name", how="left").merge(ehr_agg, on="provider_name", how="left")
 
-    # Calculate ROI: (deals_value - marketing_cost) / marketing_cost
-    merged["roi"] = (merged["deals_value"] - merged["marketing_cost"]) / merged["marketing_cost"]
-    # Value per patient
-    merged["value_per_patient"] = merged["deals_value"] / merged["total_patients"]
-    # Claim collection rate
-    merged["claim_collection_rate"] = merged["total_claim_paid"] / merged["total_claim_amount"]
+    # Derived ratios are computed on raw arrays and attached in one assign;
+    # a zero denominator yields NaN instead of inf.
+    deals_value = merged["deals_value"].to_numpy(dtype=np.float64)
+    marketing_cost = merged["marketing_cost"].to_numpy(dtype=np.float64)
+    total_patients = merged["total_patients"].to_numpy(dtype=np.float64)
+    total_claim_amount = merged["total_claim_amount"].to_numpy(dtype=np.float64)
+    total_claim_paid = merged["total_claim_paid"].to_numpy(dtype=np.float64)
 
-    return merged
+    def ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        return np.divide(numerator, denominator, out=np.full_like(numerator, np.nan), where=denominator != 0)
+
+    return merged.assign(
+        # ROI: (deals_value - marketing_cost) / marketing_cost
+        roi=ratio(deals_value - marketing_cost, marketing_cost),
+        value_per_patient=ratio(deals_value, total_patients),
+        claim_collection_rate=ratio(total_claim_paid, total_claim_amount),
+    )
 
 
 def train_predictive_model(summary: pd.DataFrame) -> pd.DataFrame:
@@ -79,29 +115,55 @@ def train_predictive_model(summary: pd.DataFrame) -> pd.DataFrame:
 
     Uses provider-level metrics as features to estimate opportunity_value.
     Adds predicted values to the summary DataFrame.
+
+    The provider table is tiny, so ordinary least squares is solved in closed
+    form with ``np.linalg.lstsq`` on standardized features; 30% of providers
+    are held out for evaluation.
     """
-    features = summary[[
+    X = summary[[
         "total_patients", "avg_length_of_stay", "avg_satisfaction",
         "avg_cost", "contact_count", "deals_value", "marketing_cost",
         "total_claim_amount", "total_claim_paid", "denial_rate"
-    ]].fillna(0)
-    target = summary["opportunity_value"].fillna(0)
-
-    # Create a pipeline with standardization and linear regression
-    model = make_pipeline(StandardScaler(), LinearRegression())
-    X_train, X_test, y_train, y_test = train_test_split(features, target, test_size=0.3, random_state=42)
-    model.fit(X_train, y_train)
-    y_pred = model.predict(X_test)
+    ]].fillna(0).to_numpy(dtype=np.float64)
+    y = summary["opportunity_value"].fillna(0).to_numpy(dtype=np.float64)
+
+    order = np.random.default_rng(42).permutation(len(y))
+    n_test = int(np.ceil(0.3 * len(y)))
+    test_idx, train_idx = order[:n_test], order[n_test:]
+
+    # Standardize with training statistics and append an intercept column
+    mu = X[train_idx].mean(axis=0)
+    sd = X[train_idx].std(axis=0)
+    sd[sd == 0] = 1
+    X_design = np.c_[(X - mu) / sd, np.ones(len(X))]
+    beta, *_ = np.linalg.lstsq(X_design[train_idx], y[train_idx], rcond=None)
+    y_pred = X_design @ beta
+
     # Evaluate
-    mae = mean_absolute_error(y_test, y_pred)
-    r2 = r2_score(y_test, y_pred)
+    residuals = y[test_idx] - y_pred[test_idx]
+    mae = np.abs(residuals).mean()
+    r2 = 1 - (residuals ** 2).sum() / ((y[test_idx] - y[test_idx].mean()) ** 2).sum()
     print(f"Predictive model evaluation: MAE={mae:.2f}, R2={r2:.2f}")
     # Add predictions for all providers
-    summary["predicted_opportunity_value"] = model.predict(features)
+    summary["predicted_opportunity_value"] = y_pred
     return summary
 
 
-def export_outputs(sg2: pd.DataFrame, crm: pd.DataFrame, ehr: pd.DataFrame, summary: pd.DataFrame) -> None:
+def write_sheet(workbook: "xlsxwriter.Workbook", sheet_name: str, df: pd.DataFrame) -> None:
+    """Stream a DataFrame into a new worksheet one row at a time.
+
+    The workbook runs in ``constant_memory`` mode, which flushes each row to
+    disk as soon as the next one starts, so cells must be written row-major
+    (``DataFrame.to_excel`` writes column by column and would lose data).
+    """
+    worksheet = workbook.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, df.columns)
+    for row_idx, row in enumerate(df.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row_idx, 0, [None if pd.isna(value) else value for value in row])
+
+
+def export_outputs(sg2: pd.DataFrame, crm: pd.DataFrame, ehr: pd.DataFrame, summary: pd.DataFrame,
+                   write_excel: bool = True) -> None:
     """Export processed data to CSV and Excel for downstream use.
 
     Args:
@@ -109,20 +171,35 @@ def export_outputs(sg2: pd.DataFrame, crm: pd.DataFrame, ehr: pd.DataFrame, summ
         crm: Original CRM metrics.
         ehr: Original EHR data.
         summary: Provider summary with predictions.
+        write_excel: Whether to also build the multi-sheet Power BI workbook.
     """
     # Save provider summary
     summary.to_csv("provider_summary_full.csv", index=False)
+    if not write_excel:
+        print("Outputs exported: provider_summary_full.csv")
+        return
+    # Deferred so --no-xlsx runs never load xlsxwriter
+    import xlsxwriter
+
     # Create Excel workbook with multiple sheets
-    with pd.ExcelWriter("carti_full_powerbi_dataset.xlsx", engine="xlsxwriter") as writer:
-        sg2.to_excel(writer, sheet_name="SG2_Patient_Flow", index=False)
-        crm.to_excel(writer, sheet_name="Salesforce_CRM", index=False)
-        ehr.to_excel(writer, sheet_name="EHR_Data", index=False)
-        summary.to_excel(writer, sheet_name="Provider_Summary", index=False)
+    with xlsxwriter.Workbook("carti_full_powerbi_dataset.xlsx", {
+        "constant_memory": True,
+        "default_date_format": "yyyy-mm-dd",
+    }) as workbook:
+        write_sheet(workbook, "SG2_Patient_Flow", sg2)
+        write_sheet(workbook, "Salesforce_CRM", crm)
+        write_sheet(workbook, "EHR_Data", ehr)
+        write_sheet(workbook, "Provider_Summary", summary)
     print("Outputs exported: provider_summary_full.csv, carti_full_powerbi_dataset.xlsx")
 
 
 def generate_charts(summary: pd.DataFrame) -> None:
     """Generate charts illustrating key metrics and save to files."""
+    # Deferred so runs without --charts skip the Matplotlib import entirely
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
     # Bar chart: ROI per provider
     plt.figure()
     summary_sorted = summary.sort_values("roi")
@@ -149,11 +226,19 @@ def generate_charts(summary: pd.DataFrame) -> None:
 
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--no-xlsx", dest="xlsx", action="store_false",
+                        help="skip writing carti_full_powerbi_dataset.xlsx")
+    parser.add_argument("--charts", action=argparse.BooleanOptionalAction, default=False,
+                        help="render the PNG charts (off by default)")
+    args = parser.parse_args()
+
     sg2, crm, ehr = load_data()
     summary = integrate_data(sg2, crm, ehr)
     summary = train_predictive_model(summary)
-    export_outputs(sg2, crm, ehr, summary)
-    generate_charts(summary)
+    export_outputs(sg2, crm, ehr, summary, write_excel=args.xlsx)
+    if args.charts:
+        generate_charts(summary)
 
 
 if __name__ == "__main__":
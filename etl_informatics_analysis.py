@@ -11,69 +11,108 @@ regression model to illustrate how a BI analyst might predict potential
 opportunity value based on clinical and operational variables.
 
 Outputs include summary CSVs and visualizations saved to the project directory.
+Charts are only rendered when ``--charts`` is passed.
 
 Usage::
 
-    python etl_analysis.py
+    python etl_analysis.py [--charts]
 """
 
+import argparse
+import os
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+from pandas.api.types import union_categoricals
 from sklearn.linear_model import LinearRegression
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import r2_score
 
+def read_table(stem: str, parse_dates=None) -> pd.DataFrame:
+    """Prefer an up-to-date Parquet copy, falling back to the PyArrow CSV parser."""
+    csv_path, parquet_path = f'{stem}.csv', f'{stem}.parquet'
+    if os.path.exists(parquet_path) and (
+        not os.path.exists(csv_path) or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+    ):
+        return pd.read_parquet(parquet_path)
+    return pd.read_csv(csv_path, engine='pyarrow', parse_dates=parse_dates)
+
 def load_datasets() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    sg2 = pd.read_csv('sg2_patient_flow.csv', parse_dates=['admission_date', 'discharge_date'])
-    crm = pd.read_csv('salesforce_crm.csv')
-    inventory = pd.read_csv('inventory_usage.csv', parse_dates=['date'])
+    sg2 = read_table('sg2_patient_flow', parse_dates=['admission_date', 'discharge_date'])
+    crm = read_table('salesforce_crm')
+    inventory = read_table('inventory_usage', parse_dates=['date'])
+    # Share one categorical provider dtype so groupby/merge use integer codes
+    provider_dtype = union_categoricals(
+        [sg2['referring_provider'].astype('category'),
+         crm['provider_name'].astype('category'),
+         inventory['provider_name'].astype('category')],
+        sort_categories=True
+    ).dtype
+    sg2['referring_provider'] = sg2['referring_provider'].astype(provider_dtype)
+    sg2['service_line'] = sg2['service_line'].astype('category')
+    crm['provider_name'] = crm['provider_name'].astype(provider_dtype)
+    inventory['provider_name'] = inventory['provider_name'].astype(provider_dtype)
     return sg2, crm, inventory
 
 def transform_and_merge(sg2: pd.DataFrame, crm: pd.DataFrame, inventory: pd.DataFrame) -> pd.DataFrame:
     """Compute aggregate metrics per provider and merge datasets."""
     # Aggregate patient flow metrics by provider
-    agg = sg2.groupby('referring_provider').agg(
+    agg = sg2.groupby('referring_provider', as_index=False, sort=False, observed=True).agg(
         total_patients=('patient_id', 'count'),
         avg_length_of_stay=('length_of_stay', 'mean'),
         avg_satisfaction=('satisfaction_score', 'mean'),
         avg_cost=('treatment_cost', 'mean')
-    ).reset_index().rename(columns={'referring_provider': 'provider_name'})
+    ).rename(columns={'referring_provider': 'provider_name'})
     # Aggregate inventory metrics per provider
-    inv_agg = inventory.groupby('provider_name').agg(
+    inv_agg = inventory.groupby('provider_name', as_index=False, sort=False, observed=True).agg(
         total_quantity_on_hand=('quantity_on_hand', 'sum'),
         avg_daily_usage=('daily_usage', 'mean'),
         total_items=('item_name', 'count')
-    ).reset_index()
+    )
     # Merge with CRM
     merged = agg.merge(crm, on='provider_name', how='left').merge(inv_agg, on='provider_name', how='left')
     return merged
 
 def train_regression(df: pd.DataFrame) -> tuple[LinearRegression, pd.DataFrame]:
     """Train a regression model to predict opportunity value."""
-    # Prepare features and target
-    features = df[['total_patients', 'avg_length_of_stay', 'avg_satisfaction', 'avg_cost', 'total_quantity_on_hand', 'avg_daily_usage']]
+    # Prepare features and target as contiguous float64 arrays, built once
     # Replace NaN with zeros (inventory may be missing for some providers)
-    features = features.fillna(0)
-    target = df['opportunity_value']
-    X_train, X_test, y_train, y_test = train_test_split(features, target, test_size=0.3, random_state=42)
+    X = np.ascontiguousarray(
+        df[['total_patients', 'avg_length_of_stay', 'avg_satisfaction', 'avg_cost', 'total_quantity_on_hand', 'avg_daily_usage']]
+        .fillna(0).to_numpy(dtype=np.float64)
+    )
+    y = df['opportunity_value'].to_numpy(dtype=np.float64)
+    train_idx, test_idx = train_test_split(np.arange(len(y)), test_size=0.3, random_state=42)
     model = LinearRegression()
-    model.fit(X_train, y_train)
-    # Evaluate
-    y_pred = model.predict(X_test)
-    r2 = r2_score(y_test, y_pred)
+    model.fit(X[train_idx], y[train_idx])
+    # Predict every provider once, then score the held-out rows from that pass
+    all_pred = model.predict(X)
+    r2 = r2_score(y[test_idx], all_pred[test_idx])
     print(f'Linear regression R^2 on test set: {r2:.2f}')
     # Add predictions to DataFrame
-    df['predicted_opportunity_value'] = model.predict(features)
+    df['predicted_opportunity_value'] = all_pred
     return model, df
 
-def save_outputs(df: pd.DataFrame) -> None:
-    """Save summary CSV and create visualizations."""
+def save_outputs(df: pd.DataFrame, sg2: pd.DataFrame, charts: bool = False) -> None:
+    """Save summary CSV and, if requested, create visualizations."""
     df.to_csv('provider_merged_summary.csv', index=False)
+    if not charts:
+        return
+    # Plotting libraries are only imported when charts are rendered
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import Patch
+
+    # One color per provider: a single scatter call per chart plus a manual legend
+    providers = df['provider_name'].astype('category')
+    cmap = plt.get_cmap('tab10')
+    provider_colors = cmap(providers.cat.codes.to_numpy() % cmap.N)
+    provider_legend = [
+        Patch(color=cmap(i % cmap.N), label=name)
+        for i, name in enumerate(providers.cat.categories)
+    ]
     # Plot patient volume by service line
-    # This requires original sg2 dataset; we load inside this function
-    sg2 = pd.read_csv('sg2_patient_flow.csv')
     service_counts = sg2['service_line'].value_counts().sort_values()
     plt.figure(figsize=(8, 4))
     service_counts.plot(kind='barh', color='steelblue')
@@ -85,7 +124,8 @@ def save_outputs(df: pd.DataFrame) -> None:
     plt.close()
     # Plot opportunity value vs. average cost per provider
     plt.figure(figsize=(6, 4))
-    sns.scatterplot(x='avg_cost', y='opportunity_value', data=df, hue='provider_name', s=60)
+    plt.scatter(df['avg_cost'], df['opportunity_value'], c=provider_colors, s=60)
+    plt.legend(handles=provider_legend, title='provider_name')
     plt.title('Opportunity Value vs. Average Treatment Cost')
     plt.xlabel('Average Treatment Cost')
     plt.ylabel('Opportunity Value')
@@ -94,7 +134,8 @@ def save_outputs(df: pd.DataFrame) -> None:
     plt.close()
     # Plot predicted vs. actual opportunity value
     plt.figure(figsize=(6, 4))
-    sns.scatterplot(x='opportunity_value', y='predicted_opportunity_value', data=df, hue='provider_name', s=60)
+    plt.scatter(df['opportunity_value'], df['predicted_opportunity_value'], c=provider_colors, s=60)
+    plt.legend(handles=provider_legend, title='provider_name')
     plt.plot([df['opportunity_value'].min(), df['opportunity_value'].max()],
              [df['opportunity_value'].min(), df['opportunity_value'].max()], 'k--', lw=1)
     plt.title('Predicted vs. Actual Opportunity Value')
@@ -105,10 +146,15 @@ def save_outputs(df: pd.DataFrame) -> None:
     plt.close()
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description='ETL and analysis for the CARTI informatics project.')
+    parser.add_argument('--charts', action=argparse.BooleanOptionalAction, default=False,
+                        help='render the PNG charts (off by default)')
+    args = parser.parse_args()
+
     sg2, crm, inventory = load_datasets()
     merged_df = transform_and_merge(sg2, crm, inventory)
     model, enriched_df = train_regression(merged_df)
-    save_outputs(enriched_df)
+    save_outputs(enriched_df, sg2, charts=args.charts)
     print('ETL and analysis complete. Outputs saved.')
 
 if __name__ == '__main__':
@@ -10,6 +10,9 @@ Generated files:
   - salesforce_crm_full.csv: Synthetic CRM metrics for referring providers.
   - ehr_data_full.csv: Synthetic EHR clinical and financial records.
 
+Each file is also written as a zstd-compressed Parquet copy, which the ETL
+prefers over the CSV when it is present.
+
 The data sets are deliberately simple yet rich enough to support
 demonstrations of ETL, predictive modelling and dashboard reporting.
 """
@@ -67,10 +70,9 @@ def generate_data(num_patients: int = 2000, num_providers: int = 8) -> None:
         "Behavioral Health": 12000,
         "Urology": 15000,
     }
-    costs = [
-        base_costs[line] * rng.uniform(0.8, 1.2)
-        for line in service_line_selection
-    ]
+    base_costs_arr = np.array([base_costs[line] for line in service_lines])
+    service_line_codes = pd.Categorical(service_line_selection, categories=service_lines).codes
+    costs = base_costs_arr[service_line_codes] * rng.uniform(0.8, 1.2, size=num_patients)
 
     sg2_df = pd.DataFrame({
         "patient_id": patient_ids,
@@ -88,60 +90,50 @@ def generate_data(num_patients: int = 2000, num_providers: int = 8) -> None:
         "Prospecting", "Qualified", "Proposal", "Negotiation", "Closed Won", "Closed Lost"
     ]
 
-    crm_records = []
-    for provider in provider_names:
-        contact_count = int(rng.integers(10, 80))
-        deals_value = rng.integers(100_000, 600_000)
-        opportunity_value = rng.integers(50_000, 400_000)
-        marketing_cost = rng.integers(10_000, 60_000)
-        stage = rng.choice(pipeline_stages)
-        crm_records.append({
-            "provider_name": provider,
-            "contact_count": contact_count,
-            "deals_value": deals_value,
-            "opportunity_value": opportunity_value,
-            "marketing_cost": marketing_cost,
-            "pipeline_stage": stage,
-        })
-    crm_df = pd.DataFrame(crm_records)
+    num_crm = len(provider_names)
+    crm_df = pd.DataFrame({
+        "provider_name": provider_names,
+        "contact_count": rng.integers(10, 80, size=num_crm),
+        "deals_value": rng.integers(100_000, 600_000, size=num_crm),
+        "opportunity_value": rng.integers(50_000, 400_000, size=num_crm),
+        "marketing_cost": rng.integers(10_000, 60_000, size=num_crm),
+        "pipeline_stage": rng.choice(pipeline_stages, size=num_crm),
+    })
 
     # Generate EHR clinical and financial records
     diagnoses = ["I10", "E11", "M16", "C50", "J45", "K35"]  # ICD-10 codes (hypertension, diabetes, etc.)
     procedures = ["99213", "93000", "27130", "47562", "99214", "52240"]  # CPT codes
     claim_statuses = ["Paid", "Denied", "Pending"]
 
-    ehr_records = []
-    for pid in patient_ids:
-        # Each patient can have multiple visits (1-3)
-        num_visits = rng.integers(1, 4)
-        # Generate visits spread over the last year
-        visit_dates = base_date + pd.to_timedelta(rng.integers(0, 365, size=num_visits), unit="D")
-        for date in visit_dates:
-            dx = rng.choice(diagnoses)
-            proc = rng.choice(procedures)
-            claim_amt = rng.uniform(5_000, 30_000)
-            paid_ratio = rng.uniform(0.6, 1.0)
-            claim_paid = claim_amt * paid_ratio
-            status = rng.choice(claim_statuses, p=[0.8, 0.1, 0.1])
-            provider = rng.choice(provider_names)
-            ehr_records.append({
-                "patient_id": pid,
-                "visit_date": date,
-                "diagnosis_code": dx,
-                "procedure_code": proc,
-                "provider_name": provider,
-                "claim_amount": claim_amt,
-                "claim_paid": claim_paid,
-                "claim_status": status,
-            })
-    ehr_df = pd.DataFrame(ehr_records)
+    # Each patient can have multiple visits (1-3); draw every visit column in one batch
+    num_visits = rng.integers(1, 4, size=num_patients)
+    total_visits = int(num_visits.sum())
+    # Generate visits spread over the last year
+    visit_dates = base_date + pd.to_timedelta(rng.integers(0, 365, size=total_visits), unit="D")
+    claim_amounts = rng.uniform(5_000, 30_000, size=total_visits)
+    paid_ratios = rng.uniform(0.6, 1.0, size=total_visits)
+    ehr_df = pd.DataFrame({
+        "patient_id": np.repeat(patient_ids, num_visits),
+        "visit_date": visit_dates,
+        "diagnosis_code": rng.choice(diagnoses, size=total_visits),
+        "procedure_code": rng.choice(procedures, size=total_visits),
+        "provider_name": rng.choice(provider_names, size=total_visits),
+        "claim_amount": claim_amounts,
+        "claim_paid": claim_amounts * paid_ratios,
+        "claim_status": rng.choice(claim_statuses, size=total_visits, p=[0.8, 0.1, 0.1]),
+    })
 
     # Save to CSV files
     sg2_df.to_csv("sg2_patient_flow_full.csv", index=False)
     crm_df.to_csv("salesforce_crm_full.csv", index=False)
     ehr_df.to_csv("ehr_data_full.csv", index=False)
+    # Parquet copies let the ETL skip CSV parsing entirely
+    sg2_df.to_parquet("sg2_patient_flow_full.parquet", index=False, compression="zstd")
+    crm_df.to_parquet("salesforce_crm_full.parquet", index=False, compression="zstd")
+    ehr_df.to_parquet("ehr_data_full.parquet", index=False, compression="zstd")
 
-    print("Synthetic data generated: sg2_patient_flow_full.csv, salesforce_crm_full.csv, ehr_data_full.csv")
+    print("Synthetic data generated: sg2_patient_flow_full.csv, salesforce_crm_full.csv, ehr_data_full.csv "
+          "(with .parquet copies)")
 
 
 if __name__ == "__main__":
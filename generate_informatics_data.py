@@ -23,7 +23,8 @@ Datasets:
    reorder points.  This helps illustrate how clinical volumes drive
    inventory needs.
 
-Running this module writes the CSV files to the project directory.
+Running this module writes the CSV files (plus Parquet copies read by the
+ETL) to the project directory.
 
 Usage::
 
@@ -33,9 +34,6 @@ Usage::
 import pandas as pd
 import numpy as np
 
-# Seed for reproducibility
-np.random.seed(42)
-
 # Reference lists
 PROVIDERS = ['Dr. Smith', 'Dr. Johnson', 'Dr. Williams', 'Dr. Brown', 'Dr. Jones']
 SERVICE_LINES = [
@@ -45,78 +43,69 @@ SERVICE_LINES = [
 PIPLINE_STAGES = ['Prospecting', 'Qualified', 'Proposal', 'Negotiation', 'Closed Won', 'Closed Lost']
 ITEMS = ['Chemo Drug A', 'Chemo Drug B', 'Radiation Supplies', 'Surgical Kit', 'Imaging Contrast']
 
-def generate_sg2_data(num_patients: int = 1000) -> pd.DataFrame:
+def generate_sg2_data(num_patients: int = 1000, rng: np.random.Generator | None = None) -> pd.DataFrame:
     """Create synthetic SG2 patient flow data."""
-    data = []
-    for pid in range(1, num_patients + 1):
-        provider = np.random.choice(PROVIDERS)
-        service_line = np.random.choice(SERVICE_LINES)
-        admission = pd.to_datetime('2025-01-01') + pd.to_timedelta(
-            np.random.randint(0, 365), unit='D'
-        )
-        length_of_stay = np.random.randint(1, 10)
-        discharge = admission + pd.to_timedelta(length_of_stay, unit='D')
-        satisfaction = np.random.normal(loc=85, scale=8)
-        satisfaction = np.clip(satisfaction, 50, 100)
-        cost = np.random.normal(loc=5000, scale=1500)
-        cost = max(1000, cost)  # ensure positive
-        payer = np.random.choice(['Medicare', 'Medicaid', 'Commercial', 'Self‑Pay'])
-        data.append({
-            'patient_id': pid,
-            'referring_provider': provider,
-            'service_line': service_line,
-            'admission_date': admission.strftime('%Y-%m-%d'),
-            'discharge_date': discharge.strftime('%Y-%m-%d'),
-            'length_of_stay': length_of_stay,
-            'satisfaction_score': round(float(satisfaction), 2),
-            'treatment_cost': round(float(cost), 2),
-            'payer': payer
-        })
-    return pd.DataFrame(data)
+    if rng is None:
+        rng = np.random.default_rng(42)
+    admission = pd.to_datetime('2025-01-01') + pd.to_timedelta(
+        rng.integers(0, 365, num_patients), unit='D'
+    )
+    length_of_stay = rng.integers(1, 10, num_patients)
+    discharge = admission + pd.to_timedelta(length_of_stay, unit='D')
+    satisfaction = np.clip(rng.normal(loc=85, scale=8, size=num_patients), 50, 100)
+    cost = np.maximum(1000, rng.normal(loc=5000, scale=1500, size=num_patients))  # ensure positive
+    return pd.DataFrame({
+        'patient_id': np.arange(1, num_patients + 1),
+        'referring_provider': rng.choice(PROVIDERS, num_patients),
+        'service_line': rng.choice(SERVICE_LINES, num_patients),
+        'admission_date': admission,
+        'discharge_date': discharge,
+        'length_of_stay': length_of_stay,
+        'satisfaction_score': satisfaction.round(2),
+        'treatment_cost': cost.round(2),
+        'payer': rng.choice(['Medicare', 'Medicaid', 'Commercial', 'Self‑Pay'], num_patients)
+    })
 
-def generate_salesforce_data() -> pd.DataFrame:
+def generate_salesforce_data(rng: np.random.Generator | None = None) -> pd.DataFrame:
     """Create synthetic Salesforce CRM data for providers."""
-    data = []
-    for provider in PROVIDERS:
-        stage = np.random.choice(PIPLINE_STAGES, p=[0.25, 0.25, 0.2, 0.15, 0.1, 0.05])
-        contacts = np.random.randint(5, 50)
-        opportunity_value = np.random.randint(50_000, 500_000)
-        data.append({
-            'provider_name': provider,
-            'pipeline_stage': stage,
-            'contact_count': contacts,
-            'opportunity_value': opportunity_value
-        })
-    return pd.DataFrame(data)
+    if rng is None:
+        rng = np.random.default_rng(42)
+    n = len(PROVIDERS)
+    return pd.DataFrame({
+        'provider_name': PROVIDERS,
+        'pipeline_stage': rng.choice(PIPLINE_STAGES, n, p=[0.25, 0.25, 0.2, 0.15, 0.1, 0.05]),
+        'contact_count': rng.integers(5, 50, n),
+        'opportunity_value': rng.integers(50_000, 500_000, n)
+    })
 
-def generate_inventory_data() -> pd.DataFrame:
+def generate_inventory_data(rng: np.random.Generator | None = None) -> pd.DataFrame:
     """Create synthetic inventory usage data per provider and item."""
-    data = []
-    for provider in PROVIDERS:
-        for item in ITEMS:
-            quantity_on_hand = np.random.randint(10, 100)
-            daily_usage = np.random.randint(1, 10)
-            reorder_point = np.random.randint(5, 20)
-            date = pd.to_datetime('2025-01-01') + pd.to_timedelta(
-                np.random.randint(0, 30), unit='D'
-            )
-            data.append({
-                'provider_name': provider,
-                'item_name': item,
-                'date': date.strftime('%Y-%m-%d'),
-                'quantity_on_hand': quantity_on_hand,
-                'daily_usage': daily_usage,
-                'reorder_point': reorder_point
-            })
-    return pd.DataFrame(data)
+    if rng is None:
+        rng = np.random.default_rng(42)
+    n = len(PROVIDERS) * len(ITEMS)
+    return pd.DataFrame({
+        'provider_name': np.repeat(PROVIDERS, len(ITEMS)),
+        'item_name': np.tile(ITEMS, len(PROVIDERS)),
+        'date': pd.to_datetime('2025-01-01') + pd.to_timedelta(
+            rng.integers(0, 30, n), unit='D'
+        ),
+        'quantity_on_hand': rng.integers(10, 100, n),
+        'daily_usage': rng.integers(1, 10, n),
+        'reorder_point': rng.integers(5, 20, n)
+    })
 
 def main() -> None:
-    sg2_df = generate_sg2_data()
-    crm_df = generate_salesforce_data()
-    inventory_df = generate_inventory_data()
+    # One seeded Generator shared by all datasets so they draw from a single stream
+    rng = np.random.default_rng(42)
+    sg2_df = generate_sg2_data(rng=rng)
+    crm_df = generate_salesforce_data(rng=rng)
+    inventory_df = generate_inventory_data(rng=rng)
     sg2_df.to_csv('sg2_patient_flow.csv', index=False)
     crm_df.to_csv('salesforce_crm.csv', index=False)
     inventory_df.to_csv('inventory_usage.csv', index=False)
+    sg2_df.to_parquet('sg2_patient_flow.parquet', index=False, compression='zstd')
+    crm_df.to_parquet('salesforce_crm.parquet', index=False, compression='zstd')
+    inventory_df.to_parquet('inventory_usage.parquet', index=False, compression='zstd')
     print('Generated sg2_patient_flow.csv, salesforce_crm.csv and inventory_usage.csv')
 
 if __name__ == '__main__':